@@ -32,17 +32,18 @@ THE SOFTWARE.
 """
 
 import os
+from functools import lru_cache
+from itertools import chain
 from sys import platform
-from ctypes import Structure, POINTER, c_void_p, c_size_t, c_double, cast, cdll
+from ctypes import Structure, c_void_p, c_size_t, c_double, cast, cdll
 import numpy as np
+import shapely
 from shapely.geometry import Polygon
 
 file_path = os.path.dirname(__file__)
 prefix = {'win32': ''}.get(platform, 'lib')
 extension = {'darwin': '.dylib', 'win32': '.dll'}.get(platform, '.so')
 
-lib = cdll.LoadLibrary(os.path.join(file_path, "target/release", prefix + "polylabel" + extension))
-
 
 class _InnersArray(Structure):
     """
@@ -65,11 +66,17 @@ class _InnersArray(Structure):
         return seq if isinstance(seq, cls) else cls(seq)
 
 
-    def __init__(self, seq, data_type = c_double):
-        ring_array_type = _FFIArray * len(seq)
+    def __init__(self, seq):
+        ring_array_type = _inner_array_type(len(seq))
         ring_array = ring_array_type()
-        for i, arr in enumerate([_FFIArray(s) for s in seq]):
+        rings = [_FFIArray(s) for s in seq]
+        for i, arr in enumerate(rings):
             ring_array[i] = arr
+        # ring_array holds copies of the ring structs, not references to them,
+        # so both it and the rings (which own the coordinate buffers) must be
+        # kept alive until the FFI call has returned
+        self._rings = rings
+        self._ring_array = ring_array
         self.data = cast(ring_array, c_void_p)
         self.len = len(seq)
 
@@ -88,29 +95,104 @@ class _FFIArray(Structure):
         """  Allow implicit conversions """
         return seq if isinstance(seq, cls) else cls(seq)
 
-    def __init__(self, seq, data_type = c_double):
-        array = np.array(seq, dtype=np.float64)
-        self._buffer = array.data
-        self.data = cast(
-            array.ctypes.data_as(POINTER(c_double)),
-            c_void_p
-        )
+    def __init__(self, seq):
+        array = np.ascontiguousarray(seq, dtype=np.float64)
+        # keep the array alive for as long as we're pointing at its buffer
+        self._array = array
+        self.data = array.ctypes.data
         self.len = len(array)
 
+
+@lru_cache(maxsize=256)
+def _inner_array_type(n):
+    """ Build the ctypes array type for n interior rings once, and reuse it """
+    return _FFIArray * n
+
+
 class _CoordResult(Structure):
     """ Container for returned FFI coordinate data """
     _fields_ = [("x_pos", c_double), ("y_pos", c_double)]
 
 
-def _unpack_coordresult(res, _func, _args):
-    """ return our coordinates in a sensible format (a tuple) """
-    return res.x_pos, res.y_pos
+@lru_cache(maxsize=None)
+def _load_lib():
+    """
+    Load the shared library and declare its function signatures
+    This is deferred until first use, so importing this module is cheap
+
+    """
+    name = prefix + "polylabel" + extension
+    # prefer a library distributed alongside this module to a local Cargo build
+    path = os.path.join(file_path, name)
+    if not os.path.exists(path):
+        path = os.path.join(file_path, "target/release", name)
+    lib = cdll.LoadLibrary(path)
+    lib.polylabel_ffi.argtypes = (_FFIArray, _InnersArray, c_double)
+    lib.polylabel_ffi.restype = _CoordResult
+    lib.polylabel_batch_ffi.argtypes = (c_void_p, c_void_p, c_void_p, c_size_t, c_double, c_void_p)
+    lib.polylabel_batch_ffi.restype = None
+    return lib
+
+
+def __getattr__(name):
+    """ Provide the library and its functions as module attributes, loading them on access """
+    if name == "lib":
+        return _load_lib()
+    if name == "_labelpos":
+        return _load_lib().polylabel_ffi
+    if name == "_labelpos_batch":
+        return _load_lib().polylabel_batch_ffi
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def _rings(ext, interiors=None):
+    """ Split a Polygon, or an exterior ring and interior rings, into (exterior, interiors) """
+    if isinstance(ext, Polygon):
+        # get_coordinates copies straight from GEOS into a float64 ndarray
+        return (
+            shapely.get_coordinates(ext.exterior),
+            [shapely.get_coordinates(ring) for ring in ext.interiors]
+        )
+    return ext, interiors or []
+
+
+def _pack_rings(rings):
+    """
+    Pack a sequence of rings into a single contiguous (n, 2) float64 array
+    Returns the array, and the offsets of each ring in it, followed by n
 
+    """
+    offsets = np.cumsum([0] + [len(ring) for ring in rings], dtype=np.uintp)
+    if not any(isinstance(ring, np.ndarray) for ring in rings):
+        # plain sequences of pairs: a single flat pass is much quicker than
+        # NumPy's generic nested-sequence parser
+        flat = chain.from_iterable(chain.from_iterable(rings))
+        coords = np.fromiter(flat, dtype=np.float64, count=2 * int(offsets[-1]))
+        return coords.reshape(-1, 2), offsets
+    if len(rings) == 1:
+        # nothing to pack: a float64 C-contiguous ring is used as-is, without a copy
+        return np.ascontiguousarray(rings[0], dtype=np.float64), offsets
+    coords = np.empty((offsets[-1], 2), dtype=np.float64)
+    for ring, start, end in zip(rings, offsets[:-1], offsets[1:]):
+        coords[start:end] = ring
+    return coords, offsets
+
+
+def _pack_polygons(polygons):
+    """
+    Pack the rings of a sequence of Shapely Polygons into a single contiguous
+    (n, 2) float64 array, copied directly from GEOS in one pass
+    Returns the array, the offsets of each ring in it, followed by n, and the
+    offsets of each Polygon's exterior ring, followed by the number of rings
 
-_labelpos = lib.polylabel_ffi
-_labelpos.argtypes = (_FFIArray, _InnersArray, c_double)
-_labelpos.restype = _CoordResult
-_labelpos.errcheck = _unpack_coordresult
+    """
+    rings, index = shapely.get_rings(polygons, return_index=True)
+    coords = shapely.get_coordinates(rings)
+    ring_offsets = np.zeros(len(rings) + 1, dtype=np.uintp)
+    np.cumsum(shapely.get_num_coordinates(rings), out=ring_offsets[1:])
+    polygon_offsets = np.zeros(len(polygons) + 1, dtype=np.uintp)
+    np.cumsum(np.bincount(index, minlength=len(polygons)), out=polygon_offsets[1:])
+    return coords, ring_offsets, polygon_offsets
 
 
 def label_position(ext, interiors=None, tolerance=1.0):
@@ -122,13 +204,56 @@ def label_position(ext, interiors=None, tolerance=1.0):
     Accepts Polygon instances as well as lists and lists of lists
     This is a terrible interface, but y'know, dynamic languages
 
+    Ring conversion happens up front; the GIL is released for the duration of
+    the calculation itself, so calls from multiple threads run concurrently
+
     """
+    # copy every ring into one buffer: the ring structs point at views into it
     if isinstance(ext, Polygon):
-        _ext = list(ext.exterior.coords)
-        _interiors = [list(ring.coords) for ring in ext.interiors]
-        return _labelpos(_ext, _interiors, tolerance)
+        coords, offsets, _ = _pack_polygons([ext])
+    else:
+        coords, offsets = _pack_rings([ext] + list(interiors or []))
+    # an empty Polygon has no rings at all
+    rings = [coords[start:end] for start, end in zip(offsets[:-1], offsets[1:])] or [coords]
+    res = _load_lib().polylabel_ffi(rings[0], rings[1:], tolerance)
+    return res.x_pos, res.y_pos
+
+
+def label_positions(polygons, tolerance=1.0):
+    """
+    Calculate the optimum label positions for a sequence of Polygons
+    Each entry may be a Shapely Polygon, or an (exterior, interiors) pair
+
+    The Polygons are processed in parallel in a single FFI call
+    Returns an (n, 2) array of label positions
+
+    """
+    polygons = list(polygons)
+    if all(isinstance(polygon, Polygon) for polygon in polygons):
+        coords, ring_offsets, polygon_offsets = _pack_polygons(polygons)
     else:
-        return _labelpos(ext, interiors, tolerance)
+        rings = []
+        polygon_offsets = [0]
+        for polygon in polygons:
+            if isinstance(polygon, Polygon):
+                _ext, _interiors = _rings(polygon)
+            else:
+                _ext, _interiors = _rings(*polygon)
+            rings.append(_ext)
+            rings.extend(_interiors)
+            polygon_offsets.append(len(rings))
+        coords, ring_offsets = _pack_rings(rings)
+        polygon_offsets = np.array(polygon_offsets, dtype=np.uintp)
+    out = np.empty((len(polygon_offsets) - 1, 2), dtype=np.float64)
+    _load_lib().polylabel_batch_ffi(
+        coords.ctypes.data,
+        ring_offsets.ctypes.data,
+        polygon_offsets.ctypes.data,
+        len(out),
+        tolerance,
+        out.ctypes.data
+    )
+    return out
 
 
 if __name__ == "__main__":
@@ -150,3 +275,10 @@ if __name__ == "__main__":
     if polres != (3.125, 2.875):
         raise ValueError('Polylabel returned an incorrect value: %s, %s' % (polres[0], polres[1]))
     print ("Shapely Polygon:", polres)
+    batchres = label_positions([pol, pol], tolerance=0.1)
+    if batchres.tolist() != [[3.125, 2.875], [3.125, 2.875]]:
+        raise ValueError('Polylabel returned incorrect values: %s' % batchres.tolist())
+    batchres = label_positions([pol, (exterior, interiors)], tolerance=0.1)
+    if batchres.tolist() != [[3.125, 2.875], [3.125, 2.875]]:
+        raise ValueError('Polylabel returned incorrect values: %s' % batchres.tolist())
+    print("Batch:", batchres.tolist())
@@ -49,3 +49,28 @@ typedef struct WrapperArray {
 struct Position polylabel_ffi(struct Array outer,
                               struct WrapperArray inners,
                               double tolerance);
+
+/**
+ * FFI access to the [`polylabel`](fn.polylabel.html) function for a batch of Polygons
+ *
+ * The Polygons are processed in parallel, and their label positions are written to `out`,
+ * which must point to `len` [`Position`](struct.Position.html)s.
+ *
+ * Ring coordinates are packed into three arrays:
+ *
+ * - `coords`: the x and y values of every point of every ring, interleaved
+ * - `ring_offsets`: the index of the first point of each ring in `coords`, followed by the total
+ * number of points
+ * - `polygon_offsets`: the index of each Polygon's exterior ring in `ring_offsets`, followed by
+ * the total number of rings. `len + 1` entries long. Any rings following a Polygon's exterior
+ * ring (and preceding the next Polygon's) are its interior rings.
+ *
+ * If an error occurs while attempting to calculate a label position, the resulting point
+ * coordinates will be NaN, NaN.
+ */
+void polylabel_batch_ffi(const double *coords,
+                         const size_t *ring_offsets,
+                         const size_t *polygon_offsets,
+                         size_t len,
+                         double tolerance,
+                         struct Position *out);
@@ -1,6 +1,7 @@
 use crate::polylabel;
 use geo::{GeoFloat, LineString, Point, Polygon};
 use libc::{c_double, c_void, size_t};
+use rayon::prelude::*;
 use std::f64;
 use std::slice;
 
@@ -43,15 +44,32 @@ where
     }
 }
 
-fn reconstitute(arr: &Array) -> Vec<[f64; 2]> {
-    unsafe { slice::from_raw_parts(arr.data as *mut [f64; 2], arr.len).to_vec() }
+// build a LineString directly from the borrowed coordinates, without an intermediate Vec
+fn reconstitute(arr: &Array) -> LineString<c_double> {
+    unsafe { slice::from_raw_parts(arr.data as *const [c_double; 2], arr.len) }
+        .iter()
+        .copied()
+        .collect()
 }
 
-fn reconstitute2(arr: WrapperArray) -> Vec<Vec<[f64; 2]>> {
-    let arrays = unsafe { slice::from_raw_parts(arr.data as *mut Array, arr.len) };
+fn reconstitute2(arr: WrapperArray) -> Vec<LineString<c_double>> {
+    let arrays = unsafe { slice::from_raw_parts(arr.data as *const Array, arr.len) };
     arrays.iter().map(|x| reconstitute(x)).collect()
 }
 
+// build a Polygon from packed coordinates. Consecutive offsets delimit each ring:
+// the first ring is the exterior, and any remaining rings are interiors
+fn unpack_polygon(coords: &[[c_double; 2]], offsets: &[size_t]) -> Polygon<c_double> {
+    let mut rings = offsets.windows(2).map(|bounds| {
+        coords[bounds[0]..bounds[1]]
+            .iter()
+            .copied()
+            .collect::<LineString<_>>()
+    });
+    let exterior = rings.next().unwrap_or_else(|| LineString(vec![]));
+    Polygon::new(exterior, rings.collect())
+}
+
 /// FFI access to the [`polylabel`](fn.polylabel.html) function
 ///
 /// Accepts three arguments:
@@ -67,23 +85,67 @@ pub extern "C" fn polylabel_ffi(
     inners: WrapperArray,
     tolerance: c_double,
 ) -> Position {
-    let exterior: LineString<_> = unsafe {
-        slice::from_raw_parts(outer.data as *mut [c_double; 2], outer.len)
-            .to_vec()
-            .into()
-    };
-    let interior: Vec<Vec<[f64; 2]>> = reconstitute2(inners);
-    let ls_int: Vec<LineString<c_double>> = interior.into_iter().map(|vec| vec.into()).collect();
-    let poly = Polygon::new(exterior, ls_int);
+    let exterior = reconstitute(&outer);
+    let interior = reconstitute2(inners);
+    let poly = Polygon::new(exterior, interior);
     polylabel(&poly, &tolerance)
         .unwrap_or_else(|_| Point::new(f64::NAN, f64::NAN))
         .into()
 }
 
+/// FFI access to the [`polylabel`](fn.polylabel.html) function for a batch of Polygons
+///
+/// The Polygons are processed in parallel, and their label positions are written to `out`,
+/// which must point to `len` [`Position`](struct.Position.html)s.
+///
+/// Ring coordinates are packed into three arrays:
+///
+/// - `coords`: the x and y values of every point of every ring, interleaved
+/// - `ring_offsets`: the index of the first point of each ring in `coords`, followed by the total
+/// number of points
+/// - `polygon_offsets`: the index of each Polygon's exterior ring in `ring_offsets`, followed by
+/// the total number of rings. `len + 1` entries long. Any rings following a Polygon's exterior
+/// ring (and preceding the next Polygon's) are its interior rings.
+///
+/// If an error occurs while attempting to calculate a label position, the resulting point
+/// coordinates will be NaN, NaN.
+#[no_mangle]
+pub extern "C" fn polylabel_batch_ffi(
+    coords: *const c_double,
+    ring_offsets: *const size_t,
+    polygon_offsets: *const size_t,
+    len: size_t,
+    tolerance: c_double,
+    out: *mut Position,
+) {
+    if len == 0 {
+        return;
+    }
+    let polygon_offsets = unsafe { slice::from_raw_parts(polygon_offsets, len + 1) };
+    let ring_offsets = unsafe { slice::from_raw_parts(ring_offsets, polygon_offsets[len] + 1) };
+    let coords = unsafe {
+        slice::from_raw_parts(
+            coords as *const [c_double; 2],
+            ring_offsets[polygon_offsets[len]],
+        )
+    };
+    let out = unsafe { slice::from_raw_parts_mut(out, len) };
+    out.par_iter_mut()
+        .zip(polygon_offsets.par_windows(2))
+        .for_each(|(position, bounds)| {
+            let poly = unpack_polygon(coords, &ring_offsets[bounds[0]..=bounds[1]]);
+            *position = polylabel(&poly, &tolerance)
+                .unwrap_or_else(|_| Point::new(f64::NAN, f64::NAN))
+                .into();
+        });
+}
+
 #[cfg(test)]
 mod tests {
-    use crate::ffi::{polylabel_ffi, reconstitute2, Array, WrapperArray};
-    use geo::Point;
+    use crate::ffi::{
+        polylabel_batch_ffi, polylabel_ffi, reconstitute2, Array, Position, WrapperArray,
+    };
+    use geo::{Coordinate, Point};
     use libc::{c_void, size_t};
     use std::mem;
 
@@ -113,7 +175,7 @@ mod tests {
         let inners = vec![i_a, i_b];
         let array = gen_wrapperarray(inners);
         let rec_inners = reconstitute2(array);
-        assert_eq!(rec_inners[0][2], [1.5, 0.5])
+        assert_eq!(rec_inners[0].0[2], Coordinate { x: 1.5, y: 0.5 })
     }
     #[test]
     fn test_ffi() {
@@ -139,4 +201,41 @@ mod tests {
         let res_point = Point::new(res.x_pos, res.y_pos);
         assert_eq!(res_point, Point::new(3.125, 2.875));
     }
+    #[test]
+    fn test_batch_ffi() {
+        // the test_ffi Polygon, followed by an L shape without interiors
+        let coords = vec![
+            4.0, 1.0, 5.0, 2.0, 5.0, 3.0, 4.0, 4.0, 3.0, 4.0, 2.0, 3.0, 2.0, 2.0, 3.0, 1.0, 4.0,
+            1.0, 3.5, 3.5, 4.4, 2.0, 2.6, 2.0, 3.5, 3.5, 4.0, 3.0, 4.0, 3.2, 4.5, 3.2, 4.0, 3.0,
+            0.0, 0.0, 4.0, 0.0, 4.0, 1.0, 1.0, 1.0, 1.0, 4.0, 0.0, 4.0, 0.0, 0.0,
+        ];
+        let ring_offsets: Vec<size_t> = vec![0, 9, 13, 17, 24];
+        let polygon_offsets: Vec<size_t> = vec![0, 3, 4];
+        let mut out = vec![
+            Position {
+                x_pos: 0.0,
+                y_pos: 0.0,
+            },
+            Position {
+                x_pos: 0.0,
+                y_pos: 0.0,
+            },
+        ];
+        polylabel_batch_ffi(
+            coords.as_ptr(),
+            ring_offsets.as_ptr(),
+            polygon_offsets.as_ptr(),
+            2,
+            0.1,
+            out.as_mut_ptr(),
+        );
+        assert_eq!(
+            Point::new(out[0].x_pos, out[0].y_pos),
+            Point::new(3.125, 2.875)
+        );
+        assert_eq!(
+            Point::new(out[1].x_pos, out[1].y_pos),
+            Point::new(0.5625, 0.5625)
+        );
+    }
 }
@@ -17,7 +17,7 @@ use errors::PolylabelError;
 #[cfg(not(target_arch = "wasm32"))]
 mod ffi;
 #[cfg(not(target_arch = "wasm32"))]
-pub use crate::ffi::{polylabel_ffi, Array, Position, WrapperArray};
+pub use crate::ffi::{polylabel_batch_ffi, polylabel_ffi, Array, Position, WrapperArray};
 
 /// Represention of a Quadtree node's cells. A node contains four Qcells.
 #[derive(Debug)]